@@ -1,12 +1,7 @@
 import os
-import requests
 from typing import List
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from langchain_community.tools.tavily_search import TavilySearchResults
-from dotenv import load_dotenv
-load_dotenv()
-from tavily import TavilyClient
+from startup.startup import load_env
 
 
 # --- Output model --- #
@@ -20,6 +15,10 @@ class ConcallInsight(BaseModel):
 # --- ReAct-style Agent --- #
 class ReActConcallAgent:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+        from langchain_community.tools.tavily_search import TavilySearchResults
+
+        load_env()
         openai_key = os.getenv("OPENAI_API_KEY")
         tavily_api_key = os.getenv("TAVILY_API_KEY")
         self.llm = ChatOpenAI(model_name="gpt-4.1-nano", temperature=0,api_key=openai_key)
@@ -46,6 +45,8 @@ Avoid speculation.
 
     def fetch_transcript(self, ticker: str) -> str:
         """Use Tavily to search for a recent earnings call transcript."""
+        import requests
+
         query = f"{ticker} latest earnings conference call transcript site:trendlyne.com OR site:moneycontrol.com OR site:investorrelations.com"
         results = self.search.run(query)
 
@@ -0,0 +1,367 @@
+# agents/embedding_store.py
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import logging
+import tempfile
+import numpy as np
+import faiss
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# On-disk layout: `path/CURRENT` names the published version directory `path/v-*`
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "LOCK"
+META_FILE = "meta.json"
+TEXTS_FILE = "texts.bin"
+OFFSETS_FILE = "offsets.npy"
+VECTORS_FILE = "vectors.npy"
+QUANT_FILE = "quant.npz"
+RAW_FILE = "raw.f32"
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8", "pq")
+PQ_MIN_CHUNKS = 256  # 8-bit PQ trains 256 centroids per sub-quantizer
+PQ_TRAIN_SIZE = 256 * 40
+STALE_BUILD_SECONDS = 24 * 3600  # leftovers of killed builds older than this get removed
+
+
+def _read_current(path: str) -> Optional[str]:
+    try:
+        with open(os.path.join(path, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def content_hash(chunks: List[str], dtype: str) -> str:
+    h = hashlib.sha256(dtype.encode("utf-8"))
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+@contextmanager
+def _locked(path: str):
+    """Exclusive cross-process lock on the store directory."""
+    fd = os.open(os.path.join(path, LOCK_FILE), os.O_RDWR | os.O_CREAT)
+    try:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10s; keep waiting for the other builder
+                    continue
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _publish(path: str, version: str, retries: int = 20):
+    """Point CURRENT at `version` with a single atomic rename."""
+    fd, tmp = tempfile.mkstemp(prefix="CURRENT-", suffix=".tmp", dir=path)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(version)
+    for attempt in range(retries):
+        try:
+            os.replace(tmp, os.path.join(path, CURRENT_FILE))
+            return
+        except PermissionError:
+            # Windows refuses while a reader has CURRENT open for its brief read
+            if attempt == retries - 1:
+                os.remove(tmp)
+                raise
+            time.sleep(0.05)
+
+
+def _last_modified(entry: str) -> float:
+    mtime = os.path.getmtime(entry)
+    if os.path.isdir(entry):
+        for name in os.listdir(entry):
+            mtime = max(mtime, os.path.getmtime(os.path.join(entry, name)))
+    return mtime
+
+
+def _cleanup(path: str):
+    """
+    Remove versions older than the published one, plus build dirs / pointer temp files
+    left by killed builds. Anything still mapped elsewhere stays for a later pass.
+    Must run under `_locked(path)`.
+    """
+    current = _read_current(path)
+    cutoff = time.time() - STALE_BUILD_SECONDS
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+        try:
+            if name.startswith("v-") and current is not None and name < current:
+                shutil.rmtree(entry, ignore_errors=True)
+            elif name.startswith("build-") and _last_modified(entry) < cutoff:
+                shutil.rmtree(entry, ignore_errors=True)
+            elif name.startswith("CURRENT-") and name.endswith(".tmp") and _last_modified(entry) < cutoff:
+                os.remove(entry)
+        except OSError:
+            continue
+
+
+# --- Memory-mapped embedding store --- #
+class EmbeddingStore:
+    """
+    Chunk texts and their embeddings kept on disk instead of in the heap.
+
+    Texts are concatenated into a single UTF-8 file indexed by an offsets array,
+    vectors live in a .npy file opened with mmap, optionally quantized to
+    float16, int8 (per-dimension min/max) or product-quantization codes.
+    Every build lands in its own version directory and is published by rewriting
+    CURRENT, so processes sharing the store never see a half-written version.
+    """
+
+    def __init__(self, path: str, version: Optional[str] = None):
+        self.path = path
+        self.version = version or _read_current(path)
+        if self.version is None:
+            raise FileNotFoundError(f"No embedding store published in {path}.")
+        vdir = os.path.join(path, self.version)
+
+        with open(os.path.join(vdir, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.dtype = self.meta["dtype"]
+        self.dim = self.meta["dim"]
+        self.offsets = np.load(os.path.join(vdir, OFFSETS_FILE), mmap_mode="r")
+        self.vectors = np.load(os.path.join(vdir, VECTORS_FILE), mmap_mode="r")
+
+        texts_path = os.path.join(vdir, TEXTS_FILE)
+        if os.path.getsize(texts_path) > 0:
+            self._texts = np.memmap(texts_path, dtype=np.uint8, mode="r")
+        else:
+            self._texts = np.zeros(0, dtype=np.uint8)
+
+        self._quant = None
+        if self.dtype in ("int8", "pq"):
+            with np.load(os.path.join(vdir, QUANT_FILE)) as q:
+                self._quant = {k: q[k] for k in q.files}
+
+    def close(self):
+        """Drop the mappings so the version directory can be deleted (required on Windows)."""
+        self.offsets = self.vectors = self._texts = None
+
+    def is_stale(self) -> bool:
+        return _read_current(self.path) != self.version
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def text(self, i: int) -> str:
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self._texts[start:end].tobytes().decode("utf-8")
+
+    # --- Build --- #
+    @classmethod
+    def build(cls,
+              path: str,
+              chunks: List[str],
+              encode,
+              dtype: str = "float16",
+              batch_size: int = 256,
+              pq_subquantizers: int = 16) -> "EmbeddingStore":
+        """
+        Encode `chunks` batch by batch with `encode` (e.g. SentenceTransformer.encode)
+        and write them to a new version of the store at `path`. Each chunk is encoded
+        exactly once; int8/pq quantize from a float32 spill file instead of re-encoding.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {SUPPORTED_DTYPES}.")
+        if not chunks:
+            raise ValueError("No chunks to embed.")
+        if dtype == "pq" and len(chunks) < PQ_MIN_CHUNKS:
+            logger.warning("Only %d chunks, too few to train PQ (need %d); storing as int8 instead.",
+                           len(chunks), PQ_MIN_CHUNKS)
+            dtype = "int8"
+
+        # Same chunks already published (e.g. a Streamlit rerun): reuse them, don't re-encode
+        digest = content_hash(chunks, dtype)
+        existing = open_store(path)
+        if existing is not None:
+            if existing.meta.get("hash") == digest:
+                return existing
+            existing.close()
+
+        os.makedirs(path, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix="build-", dir=path)
+        try:
+            dim = cls._write(build_dir, chunks, encode, dtype, batch_size, pq_subquantizers)
+            with open(os.path.join(build_dir, META_FILE), "w", encoding="utf-8") as f:
+                json.dump({"dtype": dtype, "dim": dim, "count": len(chunks), "hash": digest}, f)
+
+            # Names sort by build time, which is what _cleanup relies on
+            version = f"v-{time.time_ns():020d}-{os.getpid()}"
+            os.rename(build_dir, os.path.join(path, version))
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        with _locked(path):
+            current = _read_current(path)
+            vdir = os.path.join(path, version)
+            if not os.path.isdir(vdir) or (current is not None and current > version):
+                # Another worker published a newer build while we were encoding; theirs wins
+                shutil.rmtree(vdir, ignore_errors=True)
+            else:
+                _publish(path, version)
+            _cleanup(path)
+
+        return open_store(path)
+
+    @staticmethod
+    def _write(vdir: str, chunks: List[str], encode, dtype: str,
+               batch_size: int, pq_subquantizers: int) -> int:
+        n = len(chunks)
+
+        # Texts + offsets
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        with open(os.path.join(vdir, TEXTS_FILE), "wb") as f:
+            for i, chunk in enumerate(chunks):
+                data = chunk.encode("utf-8")
+                f.write(data)
+                offsets[i + 1] = offsets[i] + len(data)
+        np.save(os.path.join(vdir, OFFSETS_FILE), offsets)
+
+        # Single encoding pass. float32/float16 go straight to the store; int8/pq spill
+        # float32 to disk so quantizer parameters can be fitted before encoding.
+        quantized = dtype in ("int8", "pq")
+        out = None
+        vmin = vmax = None
+        for start in range(0, n, batch_size):
+            emb = np.asarray(encode(chunks[start:start + batch_size]), dtype=np.float32)
+            if out is None:
+                dim = emb.shape[1]
+                if quantized:
+                    out = np.memmap(os.path.join(vdir, RAW_FILE), dtype=np.float32, mode="w+", shape=(n, dim))
+                else:
+                    out = np.lib.format.open_memmap(
+                        os.path.join(vdir, VECTORS_FILE), mode="w+", dtype=np.dtype(dtype), shape=(n, dim)
+                    )
+            out[start:start + len(emb)] = emb
+            if dtype == "int8":
+                bmin, bmax = emb.min(axis=0), emb.max(axis=0)
+                vmin = bmin if vmin is None else np.minimum(vmin, bmin)
+                vmax = bmax if vmax is None else np.maximum(vmax, bmax)
+        out.flush()
+
+        if not quantized:
+            del out
+            return dim
+
+        raw = out
+        if dtype == "int8":
+            quant = {"vmin": vmin, "scale": np.maximum(vmax - vmin, 1e-12) / 255.0}
+            code_shape, code_dtype = (n, dim), np.int8
+        else:
+            m = pq_subquantizers
+            while dim % m:
+                m -= 1
+            sample = np.sort(np.random.default_rng(0).choice(n, min(n, PQ_TRAIN_SIZE), replace=False))
+            pq = faiss.ProductQuantizer(dim, m, 8)
+            pq.train(np.ascontiguousarray(raw[sample]))
+            quant = {"centroids": faiss.vector_to_array(pq.centroids).reshape(m, pq.ksub, pq.dsub)}
+            code_shape, code_dtype = (n, m), np.uint8
+        np.savez(os.path.join(vdir, QUANT_FILE), **quant)
+
+        vectors = np.lib.format.open_memmap(
+            os.path.join(vdir, VECTORS_FILE), mode="w+", dtype=code_dtype, shape=code_shape
+        )
+        for start in range(0, n, batch_size):
+            emb = np.ascontiguousarray(raw[start:start + batch_size])
+            if dtype == "int8":
+                codes = np.rint((emb - quant["vmin"]) / quant["scale"]) - 128
+                codes = np.clip(codes, -128, 127).astype(np.int8)
+            else:
+                codes = pq.compute_codes(emb)
+            vectors[start:start + len(codes)] = codes
+        vectors.flush()
+        del vectors, raw, out
+        os.remove(os.path.join(vdir, RAW_FILE))
+        return dim
+
+    # --- Search --- #
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        if self.dtype == "int8":
+            return (codes.astype(np.float32) + 128) * self._quant["scale"] + self._quant["vmin"]
+        return np.ascontiguousarray(codes, dtype=np.float32)
+
+    def _pq_distances(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        # Asymmetric distance: per-subspace lookup tables summed over the codes
+        centroids = self._quant["centroids"]
+        m, _, dsub = centroids.shape
+        sub_q = queries.reshape(len(queries), m, 1, dsub)
+        tables = ((sub_q - centroids[None]) ** 2).sum(axis=-1)  # (nq, m, ksub)
+        dist = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        for j in range(m):
+            dist += tables[:, j, codes[:, j]]
+        return dist
+
+    def search(self, queries: np.ndarray, top_k: int = 3,
+               batch_size: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        L2 search over the (decoded) stored vectors, streaming the memory-mapped
+        array in batches. Returns (distances, indices) shaped like faiss `Index.search`.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        nq = len(queries)
+        best_d = np.full((nq, top_k), np.inf, dtype=np.float32)
+        best_i = np.full((nq, top_k), -1, dtype=np.int64)
+
+        for start in range(0, len(self), batch_size):
+            codes = self.vectors[start:start + batch_size]
+            k = min(top_k, len(codes))
+            if self.dtype == "pq":
+                dist = self._pq_distances(queries, codes)
+                idx = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                d = np.take_along_axis(dist, idx, axis=1)
+            else:
+                d, idx = faiss.knn(queries, self._decode(codes), k)
+            d, idx = d.astype(np.float32), idx.astype(np.int64) + start
+
+            all_d = np.concatenate([best_d, d], axis=1)
+            all_i = np.concatenate([best_i, idx], axis=1)
+            order = np.argsort(all_d, axis=1)[:, :top_k]
+            best_d = np.take_along_axis(all_d, order, axis=1)
+            best_i = np.take_along_axis(all_i, order, axis=1)
+
+        return best_d, best_i
+
+    def get_texts(self, indices: Iterable[int]) -> List[str]:
+        return [self.text(int(i)) for i in indices if i >= 0]
+
+
+def open_store(path: str, retries: int = 5) -> Optional[EmbeddingStore]:
+    """Open the published version of a store, or return None if `path` has not been built yet."""
+    for attempt in range(retries):
+        if _read_current(path) is None:
+            return None
+        try:
+            return EmbeddingStore(path)
+        except FileNotFoundError:
+            # CURRENT moved on and its old target was cleaned up under us; re-read it
+            if attempt == retries - 1:
+                raise
@@ -1,15 +1,9 @@
 # agents/forensic_agent.py
 
 import os
-import yfinance as yf
-import requests
 from typing import List
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from langchain_community.tools.tavily_search import TavilySearchResults
-from dotenv import load_dotenv
-
-load_dotenv()
+from startup.startup import load_env
 
 
 # --- Output models --- #
@@ -28,6 +22,10 @@ class Report(BaseModel):
 # --- Single-pass Forensic Agent --- #
 class ReActForensicAgent:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+        from langchain_community.tools.tavily_search import TavilySearchResults
+
+        load_env()
         openai_key = os.getenv("OPENAI_API_KEY")
         tavily_key = os.getenv("TAVILY_API_KEY")
 
@@ -61,6 +59,8 @@ Be clear, objective, and explain like you're presenting to a finance team.
 """
 
     def run(self, ticker: str) -> Report:
+        import yfinance as yf
+
         # 1. Fetch data from yfinance
         try:
             stock = yf.Ticker(ticker)
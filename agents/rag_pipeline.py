@@ -1,28 +1,32 @@
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import io
-from sentence_transformers import SentenceTransformer
-import faiss
-import numpy as np
-from langchain.tools import Tool
-from langchain.agents import initialize_agent, AgentType
-from langchain.chat_models import ChatOpenAI
 import os
+import threading
 
-import pytesseract
+# Heavy dependencies (torch via sentence_transformers, faiss, fitz, pytesseract, langchain)
+# are imported inside the functions that use them so importing this module stays cheap.
 
 # Example path (adjust if yours is different)
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
 
 if not os.path.exists("static"):
     os.makedirs("static")
 # Global storage (for demo purposes; consider more robust session/state management in production)
-texts = []
-index = None
+store = None
 model = None
 llm = None
+_model_lock = threading.Lock()  # warm-up thread and request handler may race to load it
+
+# On-disk embedding store (shared by every worker process pointing at the same dir).
+# Read lazily so values from .env apply even when this module is imported directly.
+def store_dir() -> str:
+    from startup.startup import load_env
+    load_env()
+    return os.getenv("RAG_STORE_DIR", os.path.join("static", "embeddings"))
+
+def store_dtype() -> str:
+    from startup.startup import load_env
+    load_env()
+    return os.getenv("RAG_STORE_DTYPE", "float16")  # float32 | float16 | int8 | pq
 
 # --- Extract Text from PDF (OCR fallback) ---
 def extract_text_from_pdf(file_path: str) -> str:
@@ -31,6 +35,8 @@ def extract_text_from_pdf(file_path: str) -> str:
     from PIL import Image
     import io
 
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
     doc = fitz.open(file_path)
     all_text = ""
     for page_num, page in enumerate(doc):
@@ -48,30 +54,57 @@ def extract_text_from_pdf(file_path: str) -> str:
         all_text += text + "\n"
     return all_text
 # --- Split & Embed Text ---
+def get_model():
+    global model
+    with _model_lock:
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer('all-MiniLM-L6-v2')
+    return model
+
 def embed_text_chunks(text: str, chunk_size: int = 500, overlap: int = 50):
-    global texts, index, model
+    global store
+    from agents.embedding_store import EmbeddingStore
+
     texts = []
     for i in range(0, len(text), chunk_size - overlap):
         chunk = text[i:i + chunk_size]
         texts.append(chunk)
 
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    embeddings = model.encode(texts)
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(np.array(embeddings))
+    if store is not None:
+        # Release the old version's mappings so the rebuild can clean it up
+        store.close()
+        store = None
+    store = EmbeddingStore.build(store_dir(), texts, get_model().encode, dtype=store_dtype())
 
 # --- Setup LangChain LLM ---
 def setup_agent():
     global llm
+    if llm is not None:
+        return
+    from langchain_openai import ChatOpenAI
+    from startup.startup import load_env
+
+    load_env()
     openai_key = os.getenv("OPENAI_API_KEY")
     llm = ChatOpenAI(api_key=openai_key, model_name="gpt-4.1-nano", temperature=0)
 
 # --- Retrieve Top Context Passages ---
 def retrieve_context(question: str, top_k: int = 3):
-    question_embedding = model.encode([question])
-    D, I = index.search(np.array(question_embedding), top_k)
-    return "\n".join([texts[i] for i in I[0]])
+    global store
+    import numpy as np
+    from agents.embedding_store import open_store
+
+    if store is None or store.is_stale():
+        # Reuse a store built by an earlier run, or pick up another worker's newer build
+        if store is not None:
+            store.close()
+        store = open_store(store_dir())
+        if store is None:
+            raise RuntimeError("No document has been processed yet.")
+    question_embedding = get_model().encode([question])
+    D, I = store.search(np.array(question_embedding), top_k)
+    return "\n".join(store.get_texts(I[0]))
 
 # --- Main Query Function ---
 def query_document(question: str) -> str:
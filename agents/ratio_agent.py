@@ -1,13 +1,10 @@
 import os
-import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from typing import List
+from typing import TYPE_CHECKING, List
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
+from startup.startup import load_env
 
-load_dotenv()
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --- Output models --- #
 class DupontComponent(BaseModel):
@@ -25,13 +22,20 @@ class RatioReport(BaseModel):
 # --- Ratio Agent (uses Moneycontrol) --- #
 class ReActRatioAgent:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+
+        load_env()
         openai_key = os.getenv("OPENAI_API_KEY")
         self.llm = ChatOpenAI(api_key=openai_key, model_name="gpt-4", temperature=0)
 
-    def fetch_moneycontrol_ratios(self, slug: str, code: str) -> pd.DataFrame:
+    def fetch_moneycontrol_ratios(self, slug: str, code: str) -> "pd.DataFrame":
         """
         Scrape ratios table from Moneycontrol using soup instead of read_html.
         """
+        import requests
+        import pandas as pd
+        from bs4 import BeautifulSoup
+
         url = f"https://www.moneycontrol.com/financials/{slug}/ratiosVI/{code}"
         headers = {"User-Agent": "Mozilla/5.0"}
         response = requests.get(url, headers=headers, timeout=10)
@@ -52,7 +56,7 @@ class ReActRatioAgent:
         df = pd.DataFrame(data[1:], columns=data[0])
         return df
 
-    def extract_relevant_ratios(self, df: pd.DataFrame) -> pd.DataFrame:
+    def extract_relevant_ratios(self, df: "pd.DataFrame") -> "pd.DataFrame":
         """
         Keep only ROE and ROCE rows from the table.
         """
@@ -1,12 +1,8 @@
 # app.py
 
+import hashlib
 import streamlit as st
-from agents.forensic_agent import ReActForensicAgent
-from agents.ratio_agent import ReActRatioAgent
-from agents.concall_agent import ReActConcallAgent
-from router.router import RouterAgent
-from scoring.scorer import ScoringEngine
-from agents.rag_pipeline import process_document, query_document
+from startup.startup import load_env, warm_up, import_report, format_import_report
 
 # 📌 Setup
 st.set_page_config(page_title="AI Fundamental Analyst", layout="wide")
@@ -17,13 +13,26 @@ st.caption("Built with OpenAI + Screener + Tavily")
 # openai_key = st.sidebar.text_input("OpenAI API Key", type="password")
 # tavily_key = st.sidebar.text_input("Tavily API Key", type="password")
 
-from dotenv import load_dotenv
 import os
 
-load_dotenv()
+load_env()
 openai_key = os.getenv("OPENAI_API_KEY")
 tavily_key = os.getenv("TAVILY_API_KEY")
 
+# 🔥 Opt-in: preload the embedding model + LLM clients while the UI sits idle (APP_WARMUP=1)
+if os.getenv("APP_WARMUP", "0") == "1":
+    warm_up()
+
+# ⏱️ Cold import cost per module (measured once per process, capped at a minute)
+@st.cache_data(show_spinner=False)
+def cached_import_report():
+    return format_import_report(import_report())
+
+with st.sidebar.expander("⏱️ Startup report"):
+    if st.button("Measure import cost"):
+        with st.spinner("Timing imports..."):
+            st.code(cached_import_report())
+
 
 # 📤 User Input
 user_query = st.text_area("📩 Ask a financial analysis question", value="Give me a full score for INFY")
@@ -35,6 +44,11 @@ if st.button("🔍 Analyze"):
         st.stop()
 
     with st.spinner("🤖 Thinking..."):
+        from agents.forensic_agent import ReActForensicAgent
+        from agents.ratio_agent import ReActRatioAgent
+        from agents.concall_agent import ReActConcallAgent
+        from router.router import RouterAgent
+        from scoring.scorer import ScoringEngine
 
         # ⚙ Initialize agents
         router = RouterAgent()
@@ -86,10 +100,17 @@ st.header("📄 Ask Questions from Your Own Document")
 uploaded_file = st.file_uploader("Upload a PDF document to enable RAG-based querying")
 
 if uploaded_file:
-    with open("temp_uploaded.pdf", "wb") as f:
-        f.write(uploaded_file.read())
+    from agents.rag_pipeline import process_document, query_document
+
+    # Reruns (e.g. typing a question) keep the same upload: only process it once
+    pdf_bytes = uploaded_file.getvalue()
+    upload_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    if st.session_state.get("processed_upload") != upload_hash:
+        with open("temp_uploaded.pdf", "wb") as f:
+            f.write(pdf_bytes)
 
-    process_document("temp_uploaded.pdf")
+        process_document("temp_uploaded.pdf")
+        st.session_state["processed_upload"] = upload_hash
     st.success("✅ Document processed. You can now ask questions.")
 
     user_question = st.text_input("❓ Enter your question about the document")
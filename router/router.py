@@ -4,17 +4,19 @@ import os
 import json
 import re
 from typing import List
-from openai import OpenAIError
-from langchain_openai import ChatOpenAI
-from dotenv import load_dotenv
-load_dotenv()
+from startup.startup import load_env
 
 class RouterAgent:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+
+        load_env()
         openai_key = os.getenv("OPENAI_API_KEY")
         self.llm = ChatOpenAI(model_name="gpt-4.1-nano", temperature=0,api_key=openai_key)
         
     def route(self, user_query: str) -> dict:
+        from openai import OpenAIError
+
         system_prompt = f"""
 You are a query routing assistant for a financial analysis system.
 
@@ -1,10 +1,7 @@
 import os
 from typing import Optional
-from dotenv import load_dotenv
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-
-load_dotenv()
+from startup.startup import load_env
 
 # --- Scorecard model --- #
 class Scorecard(BaseModel):
@@ -19,6 +16,9 @@ class Scorecard(BaseModel):
 # --- Scoring engine --- #
 class ScoringEngine:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+
+        load_env()
         self.weights = {
             "forensic": 0.4,
             "ratio": 0.3,
@@ -0,0 +1,132 @@
+# startup/startup.py
+
+import os
+import sys
+import logging
+import time
+import subprocess
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Modules worth knowing the cold import cost of (third-party deps + our own subsystems)
+HEAVY_MODULES = [
+    "streamlit",
+    "pandas",
+    "yfinance",
+    "bs4",
+    "langchain_openai",
+    "langchain_community.tools.tavily_search",
+    "sentence_transformers",
+    "faiss",
+    "fitz",
+    "pytesseract",
+    "agents.forensic_agent",
+    "agents.ratio_agent",
+    "agents.concall_agent",
+    "agents.rag_pipeline",
+    "router.router",
+    "scoring.scorer",
+]
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+# --- Environment --- #
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load .env once per process, however many agents ask for it."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+# --- Background warm-up --- #
+def _warm_up():
+    try:
+        from agents import rag_pipeline
+
+        load_env()
+        rag_pipeline.get_model()
+        rag_pipeline.setup_agent()
+        # Agent clients are built per request; importing them here pays the langchain cost early
+        import langchain_openai  # noqa: F401
+        import langchain_community.tools.tavily_search  # noqa: F401
+    except Exception:
+        # Best effort only: the same error resurfaces when the subsystem is actually used
+        logger.warning("Warm-up failed", exc_info=True)
+
+
+def warm_up(background: bool = True) -> threading.Thread:
+    """
+    Preload the embedding model and LLM clients so the first query doesn't pay for them.
+    Safe to call on every Streamlit rerun: the work only starts once per process.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="warm-up", daemon=True)
+            _warmup_thread.start()
+    if not background:
+        _warmup_thread.join()
+    return _warmup_thread
+
+
+# --- Import cost report --- #
+# Times the import inside the child so parent packages of dotted modules are included
+_IMPORT_PROBE = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def import_cost(module: str, timeout: float = 30) -> float:
+    """
+    Cold import time of `module` (parent packages included) in seconds, measured in a
+    fresh interpreter so modules already loaded in this process don't skew it.
+    Raises ImportError if the import fails or takes longer than `timeout` seconds.
+    """
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise ImportError(f"{module} took longer than {timeout}s to import")
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1] if result.stderr else module)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_report(modules: Optional[List[str]] = None,
+                  timeout: float = 30,
+                  budget: float = 60) -> List[Tuple[str, Optional[float]]]:
+    """
+    Per-module cold import cost, slowest first. Missing or timed-out modules report None,
+    as do modules left over once `budget` seconds have been spent in total.
+    """
+    report = []
+    deadline = time.monotonic() + budget
+    for module in modules or HEAVY_MODULES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            report.append((module, None))
+            continue
+        try:
+            report.append((module, import_cost(module, min(timeout, remaining))))
+        except ImportError:
+            report.append((module, None))
+    return sorted(report, key=lambda r: -1 if r[1] is None else r[1], reverse=True)
+
+
+def format_import_report(report: List[Tuple[str, Optional[float]]]) -> str:
+    lines = []
+    for module, cost in report:
+        shown = "not installed / timed out" if cost is None else f"{cost * 1000:8.1f} ms"
+        lines.append(f"{module:<45} {shown}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_import_report(import_report(sys.argv[1:] or None)))